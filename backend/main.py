@@ -1,7 +1,12 @@
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 import uvicorn
 import os
 
@@ -12,8 +17,25 @@ sys.path.append(str(Path(__file__).parent))
 # os.environ["PROJECT_ROOT"] = str(Path(__file__).parent)
 
 from src.api.routers import co_writer, minio_files
+from src.dependencies import close_redis_client
+from src.services.llm import cloud_provider
+from src.services.storage import close_async_minio_service
 
-app = FastAPI(title="DeepTutor Co-Writer Standalone")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Blocking MinIO SDK calls run in the threadpool; the default of 40 threads
+    # caps concurrent storage requests, so raise it for the process
+    to_thread.current_default_thread_limiter().total_tokens = int(os.getenv("THREADPOOL_SIZE", "200"))
+    yield
+    await cloud_provider.close_http_client()
+    await close_async_minio_service()
+    await close_redis_client()
+
+app = FastAPI(
+    title="DeepTutor Co-Writer Standalone",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +45,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress text bodies (markdown files, large listings) above 1 KB.
+# Small JSON replies and streamed chunks below the threshold pass through as-is.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # ============================================
 # MOCK MODE FOR NON-AI USAGE
 # ============================================
@@ -50,17 +76,13 @@ if not os.getenv("LLM_API_KEY") and not os.getenv("OPENAI_API_KEY"):
 
     async def mock_auto_mark(self, text: str):
         operation_id = datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + uuid.uuid4().hex[:6]
-        # Just wrap some words in tags to demonstrate UI
-        words = text.split()
-        marked_words = []
-        for i, word in enumerate(words):
-            if i % 3 == 0:
-                # Add a sample annotation tag
-                marked_words.append(f'<span data-rough-notation="highlight">{word}</span>')
-            else:
-                marked_words.append(word)
+        # Just wrap every third word in a sample annotation tag to demonstrate UI
+        marked_text = " ".join(
+            f'<span data-rough-notation="highlight">{word}</span>' if i % 3 == 0 else word
+            for i, word in enumerate(text.split())
+        )
         
-        return {"marked_text": " ".join(marked_words), "operation_id": operation_id}
+        return {"marked_text": marked_text, "operation_id": operation_id}
 
     # Monkeypatch the class methods
     EditAgent.process = mock_process
@@ -69,18 +91,34 @@ if not os.getenv("LLM_API_KEY") and not os.getenv("OPENAI_API_KEY"):
 app.include_router(co_writer.router, prefix="/api/v1/co_writer", tags=["Co-Writer"])
 app.include_router(minio_files.router)  # Files API
 
+# Constant bodies are serialized once at import; liveness probes hit /health continuously
+_HEALTH_BODY = orjson.dumps({"status": "ok", "mock_mode": not os.getenv("LLM_API_KEY")})
+_KNOWLEDGE_BASES_BODY = orjson.dumps([{"name": "Default KB"}])
+_TTS_STATUS_BODY = orjson.dumps({"available": False})
+
 @app.get("/health")
-def health_check():
-    return {"status": "ok", "mock_mode": not os.getenv("LLM_API_KEY")}
+async def health_check():
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 # Mock endpoints for other services if CoWriterEditor calls them
 @app.get("/api/v1/knowledge/list")
-def list_knowledge_bases():
-    return [{"name": "Default KB"}]
+async def list_knowledge_bases():
+    return Response(content=_KNOWLEDGE_BASES_BODY, media_type="application/json")
 
 @app.get("/api/v1/co_writer/tts/status")
-def tts_status():
-    return {"available": False}
+async def tts_status():
+    return Response(content=_TTS_STATUS_BODY, media_type="application/json")
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8001, reload=True)
+    # uvloop + httptools come with uvicorn[standard]; reload is dev-only and
+    # forces a single worker, so keep it opt-in via UVICORN_RELOAD.
+    reload = os.getenv("UVICORN_RELOAD", "false").lower() == "true"
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if reload else int(os.getenv("WEB_CONCURRENCY", "4")),
+        reload=reload,
+    )
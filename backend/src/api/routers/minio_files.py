@@ -6,20 +6,57 @@ REST API endpoints for managing files in MinIO object storage.
 Provides file browser, search, read, and write operations.
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from datetime import datetime, timezone
+from functools import lru_cache
+import hashlib
 import logging
+import os
 
-from src.services.storage import get_minio_service, FileInfo
+import orjson
+from minio.error import S3Error
+from redis.exceptions import RedisError
+
+from src.services.storage import get_minio_service, get_async_minio_service, FileInfo, is_directory_index
 from src.middleware.auth import get_current_user
 from src.middleware.permissions import require_permission
-from src.dependencies import get_file_lock_manager
+from src.dependencies import get_file_lock_manager, get_redis_client
 
 logger = logging.getLogger("MinIOFilesRouter")
 
 router = APIRouter(prefix="/api/v1/files", tags=["files"])
 
+# Chunk size used when streaming raw file bodies back to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# TTL (seconds) for cached listing payloads in Redis
+LIST_CACHE_TTL = int(os.getenv("FILES_LIST_CACHE_TTL", "15"))
+
+# TTL (seconds) for the per-bucket search index; writes update it in place
+SEARCH_INDEX_TTL = int(os.getenv("FILES_SEARCH_INDEX_TTL", "300"))
+
+# Fuzzy search tuning: shorter queries are matched as substrings instead of
+# ranked; ranking returns the top N hits
+SEARCH_MIN_LENGTH = 2
+SEARCH_LIMIT = 50
+
+# Entries of the search index are written in batches of this many fields
+SEARCH_INDEX_BATCH_SIZE = 10_000
+
+# Set a search index entry only while the index exists, so a write never
+# leaves behind a partial index without a TTL
+LUA_SEARCH_INDEX_SET = """
+if redis.call("exists", KEYS[1]) == 1 then
+    return redis.call("hset", KEYS[1], ARGV[1], ARGV[2])
+else
+    return 0
+end
+"""
+
 
 # ============================================================================
 # Request/Response Models
@@ -29,7 +66,7 @@ class FileMetadata(BaseModel):
     """File metadata response"""
     name: str
     size: int
-    last_modified: str
+    last_modified: Optional[str] = None
     content_type: str
     is_dir: bool = False
 
@@ -38,6 +75,8 @@ class FilesListResponse(BaseModel):
     """Response for file listing"""
     files: List[FileMetadata]
     total: int
+    is_truncated: bool = False
+    next_token: Optional[str] = None
 
 
 class FileContentResponse(BaseModel):
@@ -72,13 +111,194 @@ class SaveFileResponse(BaseModel):
     success: bool
     message: str
     size: int
+    etag: Optional[str] = None
+    version_id: Optional[str] = None
+
+
+class DeleteFileResponse(BaseModel):
+    """Response after deleting file"""
+    success: bool
+    message: str
+
+
+class BucketsResponse(BaseModel):
+    """Response for bucket listing"""
+    buckets: List[str]
+
+
+class DirectoryIndexResponse(BaseModel):
+    """Response after writing a directory index"""
+    success: bool
+    message: str
+    indexed: int
+
+
+class DirectoryIndexQuery(BaseModel):
+    """Request to query a directory index"""
+    prefix: str = ""
+    # Field -> value (equality) or [operator, value]; see query_directory_index
+    where: Dict[str, Any] = {}
+
+
+class DirectoryIndexRowsResponse(BaseModel):
+    """Response for a directory index query"""
+    rows: List[Dict[str, Any]]
+    total: int
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def _wants_json(request: Request) -> bool:
+    """Whether the client asked for the JSON content envelope"""
+    return "application/json" in request.headers.get("accept", "")
+
+
+def _stream_object(response) -> StreamingResponse:
+    """Stream a MinIO object response to the client in fixed-size chunks"""
+    def iter_chunks():
+        try:
+            yield from response.stream(STREAM_CHUNK_SIZE)
+        finally:
+            response.close()
+            response.release_conn()
+
+    headers = {}
+    if response.headers.get("Content-Length"):
+        headers["Content-Length"] = response.headers["Content-Length"]
+    if response.headers.get("Last-Modified"):
+        headers["X-Last-Modified"] = response.headers["Last-Modified"]
+
+    return StreamingResponse(
+        iter_chunks(),
+        media_type=response.headers.get("Content-Type") or "application/octet-stream",
+        headers=headers,
+    )
+
+
+@lru_cache(maxsize=32)
+def _parse_extensions(extensions: str) -> Tuple[str, ...]:
+    """Parse the comma-separated extensions query (a handful of distinct values in practice)"""
+    return tuple(ext.strip() for ext in extensions.split(",") if ext.strip())
+
+
+def _list_cache_key(bucket: str, *parts) -> str:
+    """Build the Redis key for a cached listing of `bucket`"""
+    digest = hashlib.blake2b(orjson.dumps(parts), digest_size=16).hexdigest()
+    return f"list:{bucket}:{digest}"
+
+
+async def _list_cache_get(key: str) -> Optional[bytes]:
+    """Read a cached listing payload; cache errors are treated as a miss"""
+    try:
+        return await get_redis_client().get(key)
+    except RedisError as e:
+        logger.warning(f"List cache read failed for {key}: {e}")
+        return None
+
+
+async def _list_cache_set(key: str, payload: bytes) -> None:
+    """Store a listing payload with a short TTL"""
+    try:
+        await get_redis_client().set(key, payload, ex=LIST_CACHE_TTL)
+    except RedisError as e:
+        logger.warning(f"List cache write failed for {key}: {e}")
+
+
+def _search_index_key(bucket: str) -> str:
+    """Redis key of the fuzzy search index of `bucket` (outside `list:{bucket}:`)"""
+    return f"search:{bucket}"
+
+
+async def _search_index(bucket: str) -> List[FileInfo]:
+    """
+    Get the full recursive listing of `bucket` used for fuzzy search.
+    
+    The listing is kept in a Redis hash of name -> entry. Saves and deletes
+    update their own entry (see _search_index_update) instead of dropping the
+    index, so a write doesn't force a full relist; the index is rebuilt only
+    when it is missing, at most every SEARCH_INDEX_TTL seconds. It is read
+    from MinIO directly, not from the service's per-process cache, which a
+    save handled by another worker would leave stale.
+    """
+    key = _search_index_key(bucket)
+    try:
+        cached = await get_redis_client().hvals(key)
+    except RedisError as e:
+        logger.warning(f"Search index read failed for {bucket}: {e}")
+        cached = None
+    if cached:
+        files = [
+            FileInfo(
+                name=d["name"],
+                size=d["size"],
+                last_modified=datetime.fromisoformat(d["last_modified"]) if d["last_modified"] else None,
+                content_type=d["content_type"],
+                is_dir=d["is_dir"]
+            )
+            for d in map(orjson.loads, cached)
+        ]
+        # Hash fields come back unordered; keep ranking ties deterministic
+        files.sort(key=lambda f: f.name)
+        return files
+    
+    files = await run_in_threadpool(
+        get_minio_service().list_files, bucket, recursive=True, parallel=True, use_cache=False
+    )
+    if files:
+        try:
+            async with get_redis_client().pipeline(transaction=True) as pipe:
+                for start in range(0, len(files), SEARCH_INDEX_BATCH_SIZE):
+                    batch = files[start:start + SEARCH_INDEX_BATCH_SIZE]
+                    pipe.hset(key, mapping={f.name: orjson.dumps(f) for f in batch})
+                pipe.expire(key, SEARCH_INDEX_TTL)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Search index write failed for {bucket}: {e}")
+    return files
+
+
+async def _search_index_update(bucket: str, path: str, size: Optional[int] = None) -> None:
+    """
+    Apply a save (`size` given) or a delete (`size` omitted) of `path` to the
+    bucket's search index. Nothing is written while the index isn't built;
+    the next search builds it from MinIO.
+    """
+    if is_directory_index(path):
+        return
+    
+    key = _search_index_key(bucket)
+    try:
+        client = get_redis_client()
+        if size is None:
+            await client.hdel(key, path)
+        else:
+            entry = FileInfo(name=path, size=size, last_modified=datetime.now(timezone.utc))
+            await client.register_script(LUA_SEARCH_INDEX_SET)(keys=[key], args=[path, orjson.dumps(entry)])
+    except RedisError as e:
+        logger.warning(f"Search index update failed for {bucket}/{path}: {e}")
+
+
+async def _invalidate_list_cache(bucket: str) -> None:
+    """Drop every cached listing for `bucket` after a write"""
+    try:
+        client = get_redis_client()
+        keys = [key async for key in client.scan_iter(match=f"list:{bucket}:*", count=500)]
+        if keys:
+            await client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"List cache invalidation failed for {bucket}: {e}")
 
 
 # ============================================================================
 # API Endpoints
 # ============================================================================
+# Listing and write endpoints build plain dicts and return ORJSONResponse directly.
+# The response models are kept in `responses=` so OpenAPI still documents
+# them, without paying for a second Pydantic validation pass at runtime.
 
-@router.get("/buckets", response_model=dict)
+@router.get("/buckets", response_model=None, responses={200: {"model": BucketsResponse}})
 async def list_buckets(current_user: dict = Depends(get_current_user)):
     """
     List all available MinIO buckets.
@@ -89,20 +309,23 @@ async def list_buckets(current_user: dict = Depends(get_current_user)):
     """
     try:
         minio = get_minio_service()
-        buckets = minio.list_buckets()
-        return {"buckets": buckets}
+        buckets = await run_in_threadpool(minio.list_buckets)
+        return ORJSONResponse({"buckets": buckets})
     except Exception as e:
         logger.error(f"Failed to list buckets: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to list buckets: {str(e)}")
 
 
-@router.get("/{bucket}", response_model=FilesListResponse)
+@router.get("/{bucket}", response_model=None, responses={200: {"model": FilesListResponse}})
 async def list_files(
     bucket: str,
     prefix: str = Query("", description="Filter by prefix"),
     recursive: bool = Query(False, description="List recursively"),
     search: str = Query("", description="Search query for filenames"),
+    search_mode: Literal["fuzzy", "prefix"] = Query("fuzzy", description="Ranked fuzzy match, or names starting with the query"),
     extensions: str = Query(".md,.markdown,.txt", description="Comma-separated file extensions"),
+    continuation_token: Optional[str] = Query(None, description="Resume listing after this key (next_token of the previous page)"),
+    max_keys: int = Query(1000, ge=1, le=1000, description="Maximum number of entries per page"),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -118,45 +341,100 @@ async def list_files(
         List recursively (default: False)
     search : str, optional
         Search query for filename
+    search_mode : str, optional
+        "fuzzy" ranks names by similarity (queries under 2 characters
+        are matched as case-insensitive substrings instead);
+        "prefix" pages through names under `prefix` that start with the
+        query, case-sensitively (default: fuzzy)
     extensions : str, optional
         Comma-separated extensions (default: .md,.markdown,.txt)
+    continuation_token : str, optional
+        `next_token` from the previous page
+    max_keys : int, optional
+        Page size, capped at 1000 (default: 1000)
     
     Returns:
     -------
-        FilesListResponse with files and total count
+        FilesListResponse with files, total count and pagination info
     """
     try:
+        cache_key = _list_cache_key(
+            bucket, "files", prefix, recursive, search, search_mode, extensions, continuation_token, max_keys
+        )
+        cached = await _list_cache_get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
         minio = get_minio_service()
         
-        # Parse extensions
-        ext_list = [ext.strip() for ext in extensions.split(",") if ext.strip()]
+        ext_list = _parse_extensions(extensions)
         
-        # Get files
-        if search:
-            files = minio.search_files(bucket, search, prefix)
+        # Get files; fetch one extra entry to detect whether more pages exist
+        if search and search_mode == "prefix":
+            # Pushed down to MinIO as a longer list prefix where possible
+            files = await run_in_threadpool(
+                minio.search_files,
+                bucket, search, prefix,
+                case_sensitive=True,
+                starts_with=True,
+                recursive=recursive,
+                extensions=ext_list,
+                start_after=continuation_token,
+                max_results=max_keys + 1,
+                use_cache=False
+            )
+        elif len(search) >= SEARCH_MIN_LENGTH:
+            # Ranked results are a single page
+            files = await run_in_threadpool(
+                minio.fuzzy_search,
+                bucket, search, prefix,
+                limit=min(SEARCH_LIMIT, max_keys),
+                files=await _search_index(bucket),
+                extensions=ext_list
+            )
+        elif search:
+            # Too short to rank; match it as a substring, ignoring case
+            files = await run_in_threadpool(
+                minio.search_files,
+                bucket, search, prefix,
+                recursive=recursive,
+                extensions=ext_list,
+                start_after=continuation_token,
+                max_results=max_keys + 1,
+                use_cache=False
+            )
         else:
-            files = minio.list_files(bucket, prefix, recursive=recursive, extensions=ext_list)
-        
-        # Convert to response format
-        file_metadata = [
-            FileMetadata(
-                name=f.name,
-                size=f.size,
-                last_modified=f.last_modified.isoformat() if f.last_modified else "",
-                content_type=f.content_type,
-                is_dir=f.is_dir
+            files = await run_in_threadpool(
+                minio.list_files,
+                bucket, prefix,
+                recursive=recursive,
+                extensions=ext_list,
+                start_after=continuation_token,
+                max_keys=max_keys + 1,
+                use_cache=False
             )
-            for f in files
-        ]
         
-        return FilesListResponse(files=file_metadata, total=len(file_metadata))
+        is_truncated = len(files) > max_keys
+        if is_truncated:
+            files = files[:max_keys]
+        next_token = files[-1].name if is_truncated else None
+        
+        # FileInfo serializes natively; no per-entry dicts
+        payload = orjson.dumps({
+            "files": files,
+            "total": len(files),
+            "is_truncated": is_truncated,
+            "next_token": next_token,
+        })
+        await _list_cache_set(cache_key, payload)
+        return Response(content=payload, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Failed to list files in {bucket}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to list files: {str(e)}")
 
 
-@router.get("/{bucket}/{path:path}/versions", response_model=FileVersionsResponse)
+@router.get("/{bucket}/{path:path}/versions", response_model=None, responses={200: {"model": FileVersionsResponse}})
 async def list_file_versions(bucket: str, path: str, current_user: dict = Depends(get_current_user)):
     """
     List all versions of a file.
@@ -173,24 +451,20 @@ async def list_file_versions(bucket: str, path: str, current_user: dict = Depend
         FileVersionsResponse with list of versions
     """
     try:
+        cache_key = _list_cache_key(bucket, "versions", path)
+        cached = await _list_cache_get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
         minio = get_minio_service()
         
         # Get versions
-        versions_data = minio.list_file_versions(bucket, path)
-        
-        # Convert to response model
-        versions = [
-            FileVersion(
-                version_id=v["version_id"],
-                last_modified=v["last_modified"],
-                size=v["size"],
-                is_latest=v["is_latest"],
-                is_delete_marker=v["is_delete_marker"]
-            )
-            for v in versions_data
-        ]
+        versions_data = await run_in_threadpool(minio.list_file_versions, bucket, path)
         
-        return FileVersionsResponse(versions=versions, total=len(versions))
+        # Service already returns plain dicts in the response shape
+        payload = orjson.dumps({"versions": versions_data, "total": len(versions_data)})
+        await _list_cache_set(cache_key, payload)
+        return Response(content=payload, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Failed to list versions for {bucket}/{path}: {e}")
@@ -198,10 +472,19 @@ async def list_file_versions(bucket: str, path: str, current_user: dict = Depend
 
 
 @router.get("/{bucket}/{path:path}/versions/{version_id}", response_model=FileContentResponse)
-async def get_file_version(bucket: str, path: str, version_id: str, current_user: dict = Depends(get_current_user)):
+async def get_file_version(
+    bucket: str,
+    path: str,
+    version_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
     """
     Get specific version of a file.
     
+    The raw body is streamed unless the client sends `Accept: application/json`,
+    in which case the JSON content envelope is returned.
+    
     Parameters:
     ----------
     bucket : str
@@ -218,21 +501,31 @@ async def get_file_version(bucket: str, path: str, version_id: str, current_user
     try:
         minio = get_minio_service()
         
-        # Read version content
-        content = minio.get_file_version(bucket, path, version_id)
+        if not _wants_json(request):
+            try:
+                response = await run_in_threadpool(minio.get_file_stream, bucket, path, version_id=version_id)
+            except S3Error as e:
+                if e.code in ("NoSuchKey", "NoSuchVersion"):
+                    raise HTTPException(status_code=404, detail=f"Version not found: {version_id}")
+                raise
+            return _stream_object(response)
         
-        # Get version metadata from versions list
-        versions_data = minio.list_file_versions(bucket, path)
-        version_info = next((v for v in versions_data if v["version_id"] == version_id), None)
+        # Get version metadata directly instead of scanning the versions list
+        try:
+            version_info = await run_in_threadpool(minio.stat_version, bucket, path, version_id)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchVersion"):
+                raise HTTPException(status_code=404, detail=f"Version not found: {version_id}")
+            raise
         
-        if not version_info:
-            raise HTTPException(status_code=404, detail=f"Version not found: {version_id}")
+        # Read version content
+        content = await run_in_threadpool(minio.get_file_version, bucket, path, version_id)
         
         metadata = FileMetadata(
             name=path,
             size=version_info["size"],
-            last_modified=version_info["last_modified"],
-            content_type="",  # MinIO doesn't track content type per version
+            last_modified=version_info["last_modified"] or "",
+            content_type=version_info["content_type"],
             is_dir=False
         )
         
@@ -246,10 +539,13 @@ async def get_file_version(bucket: str, path: str, version_id: str, current_user
 
 
 @router.get("/{bucket}/{path:path}", response_model=FileContentResponse)
-async def get_file(bucket: str, path: str, current_user: dict = Depends(get_current_user)):
+async def get_file(bucket: str, path: str, request: Request, current_user: dict = Depends(get_current_user)):
     """
     Read file content.
     
+    The raw body is streamed unless the client sends `Accept: application/json`,
+    in which case the JSON content envelope is returned.
+    
     Parameters:
     ----------
     bucket : str
@@ -264,19 +560,30 @@ async def get_file(bucket: str, path: str, current_user: dict = Depends(get_curr
     try:
         minio = get_minio_service()
         
-        # Check if file exists
-        if not minio.file_exists(bucket, path):
-            raise HTTPException(status_code=404, detail=f"File not found: {bucket}/{path}")
+        if not _wants_json(request):
+            try:
+                response = await run_in_threadpool(minio.get_file_stream, bucket, path)
+            except S3Error as e:
+                if e.code == "NoSuchKey":
+                    raise HTTPException(status_code=404, detail=f"File not found: {bucket}/{path}")
+                raise
+            return _stream_object(response)
         
-        # Read content
-        content = minio.get_file(bucket, path)
+        # A single HEAD gives both the existence check and the metadata
+        try:
+            file_info = await run_in_threadpool(minio.stat_object, bucket, path)
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                raise HTTPException(status_code=404, detail=f"File not found: {bucket}/{path}")
+            raise
         
-        # Get metadata
-        files = minio.list_files(bucket, prefix=path, recursive=False)
-        if not files:
-            raise HTTPException(status_code=404, detail=f"File metadata not found: {bucket}/{path}")
+        # Read content on the event loop instead of holding a worker thread;
+        # hedged reads (MINIO_HEDGE_AFTER_MS) need the blocking client's threads
+        if minio.hedge_after_ms > 0:
+            content = await run_in_threadpool(minio.get_file, bucket, path)
+        else:
+            content = await get_async_minio_service().get_file(bucket, path)
         
-        file_info = files[0]
         metadata = FileMetadata(
             name=file_info.name,
             size=file_info.size,
@@ -304,11 +611,11 @@ async def acquire_file_lock(
 ):
     """Acquire exclusive lock on file"""
     manager = get_file_lock_manager()
-    success = manager.acquire_lock(f"{bucket}/{path}", current_user["id"])
+    success = await manager.acquire_lock(f"{bucket}/{path}", current_user["id"])
     if not success:
-        owner = manager.get_lock_owner(f"{bucket}/{path}")
+        owner = await manager.get_lock_owner(f"{bucket}/{path}")
         if owner == current_user["id"]:
-             manager.extend_lock(f"{bucket}/{path}", current_user["id"])
+             await manager.extend_lock(f"{bucket}/{path}", current_user["id"])
              return {"locked": True, "user": current_user["username"]}
         raise HTTPException(status_code=409, detail=f"File locked by user: {owner}")
     return {"locked": True, "user": current_user["username"]}
@@ -321,9 +628,9 @@ async def extend_file_lock(
 ):
     """Extend lock TTL"""
     manager = get_file_lock_manager()
-    success = manager.extend_lock(f"{bucket}/{path}", current_user["id"], ttl=60)
+    success = await manager.extend_lock(f"{bucket}/{path}", current_user["id"], ttl=60)
     if not success:
-         owner = manager.get_lock_owner(f"{bucket}/{path}")
+         owner = await manager.get_lock_owner(f"{bucket}/{path}")
          if owner and owner != current_user["id"]:
               raise HTTPException(status_code=409, detail=f"Lock owner changed to: {owner}")
          raise HTTPException(status_code=409, detail="Lock lost or expired")
@@ -337,11 +644,11 @@ async def release_file_lock(
 ):
     """Release file lock"""
     manager = get_file_lock_manager()
-    manager.release_lock(f"{bucket}/{path}", current_user["id"])
+    await manager.release_lock(f"{bucket}/{path}", current_user["id"])
     return {"locked": False}
 
 
-@router.put("/{bucket}/{path:path}", response_model=SaveFileResponse)
+@router.put("/{bucket}/{path:path}", response_model=None, responses={200: {"model": SaveFileResponse}})
 @require_permission("write")
 async def save_file(
     bucket: str, 
@@ -363,32 +670,34 @@ async def save_file(
     
     Returns:
     -------
-        SaveFileResponse with success status and file size
+        SaveFileResponse with success status, file size, ETag and version ID
     """
     try:
         # Check lock
         manager = get_file_lock_manager()
-        owner = manager.get_lock_owner(f"{bucket}/{path}")
+        owner = await manager.get_lock_owner(f"{bucket}/{path}")
         if owner and owner != current_user["id"]:
             raise HTTPException(status_code=409, detail=f"File is locked by another user: {owner}")
 
         minio = get_minio_service()
         
         # Save file
-        size = minio.save_file(bucket, path, request.content)
+        result = await run_in_threadpool(minio.save_file, bucket, path, request.content)
+        await _invalidate_list_cache(bucket)
+        await _search_index_update(bucket, path, result["size"])
         
-        return SaveFileResponse(
-            success=True,
-            message=f"File saved successfully: {bucket}/{path}",
-            size=size
-        )
+        return ORJSONResponse({
+            "success": True,
+            "message": f"File saved successfully: {bucket}/{path}",
+            **result
+        })
         
     except Exception as e:
         logger.error(f"Failed to save file {bucket}/{path}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
 
-@router.delete("/{bucket}/{path:path}", response_model=dict)
+@router.delete("/{bucket}/{path:path}", response_model=None, responses={200: {"model": DeleteFileResponse}})
 @require_permission("delete")
 async def delete_file(bucket: str, path: str, current_user: dict = Depends(get_current_user)):
     """
@@ -408,26 +717,118 @@ async def delete_file(bucket: str, path: str, current_user: dict = Depends(get_c
     try:
         # Check lock before delete
         manager = get_file_lock_manager()
-        owner = manager.get_lock_owner(f"{bucket}/{path}")
+        owner = await manager.get_lock_owner(f"{bucket}/{path}")
         if owner and owner != current_user["id"]:
              raise HTTPException(status_code=409, detail=f"File is locked by another user: {owner}")
 
         minio = get_minio_service()
         
         # Check if file exists
-        if not minio.file_exists(bucket, path):
+        if not await run_in_threadpool(minio.file_exists, bucket, path):
             raise HTTPException(status_code=404, detail=f"File not found: {bucket}/{path}")
         
         # Delete file
-        minio.delete_file(bucket, path)
+        await run_in_threadpool(minio.delete_file, bucket, path)
+        await _invalidate_list_cache(bucket)
+        await _search_index_update(bucket, path)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": f"File deleted successfully: {bucket}/{path}"
-        }
+        })
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to delete file {bucket}/{path}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete file: {str(e)}")
+
+
+# Directory Index Endpoints
+
+def _directory_prefix(prefix: str) -> str:
+    """Directory prefixes end in "/" (the bucket root is "")"""
+    return prefix if not prefix or prefix.endswith("/") else prefix + "/"
+
+
+@router.post("/{bucket}/index", response_model=None, responses={200: {"model": DirectoryIndexResponse}})
+@require_permission("write")
+async def write_directory_index(
+    bucket: str,
+    prefix: str = Query("", description="Directory prefix to index (default: bucket root)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    (Re)build the `_index.json` metadata sidecar of one directory.
+    
+    Reads every markdown file directly under the directory, so run it after
+    bulk changes rather than on every save.
+    
+    Parameters:
+    ----------
+    bucket : str
+        Bucket name
+    prefix : str, optional
+        Directory prefix (default: bucket root)
+    
+    Returns:
+    -------
+        DirectoryIndexResponse with the number of files indexed
+    """
+    prefix = _directory_prefix(prefix)
+    try:
+        minio = get_minio_service()
+        indexed = await run_in_threadpool(minio.write_directory_index, bucket, prefix)
+        
+        return ORJSONResponse({
+            "success": True,
+            "message": f"Indexed {indexed} files in {bucket}/{prefix}",
+            "indexed": indexed
+        })
+        
+    except Exception as e:
+        logger.error(f"Failed to index {bucket}/{prefix}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to index directory: {str(e)}")
+
+
+@router.post("/{bucket}/index/query", response_model=None, responses={200: {"model": DirectoryIndexRowsResponse}})
+async def query_directory_index(
+    bucket: str,
+    request: DirectoryIndexQuery,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Query a directory's metadata sidecar with S3 Select.
+    
+    Parameters:
+    ----------
+    bucket : str
+        Bucket name
+    request : DirectoryIndexQuery
+        Directory prefix and field conditions, e.g.
+        {"prefix": "docs/", "where": {"status": "draft", "tags": ["LIKE", "%math%"]}}
+    
+    Returns:
+    -------
+        DirectoryIndexRowsResponse with the matching rows
+    """
+    prefix = _directory_prefix(request.prefix)
+    try:
+        minio = get_minio_service()
+        
+        try:
+            rows = await run_in_threadpool(minio.query_directory_index, bucket, prefix, request.where)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                raise HTTPException(status_code=404, detail=f"No directory index for {bucket}/{prefix}")
+            raise
+        
+        return ORJSONResponse({"rows": rows, "total": len(rows)})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to query index of {bucket}/{prefix}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to query directory index: {str(e)}")
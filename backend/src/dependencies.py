@@ -1,18 +1,30 @@
-from typing import Generator
 import os
-import redis
+import redis.asyncio as aioredis
 from src.services.file_lock import FileLockManager
 
 _redis_client = None
 _file_lock_manager = None
 
-def get_redis_client() -> redis.Redis:
+def get_redis_client() -> aioredis.Redis:
     global _redis_client
     if _redis_client is None:
         redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        _redis_client = redis.from_url(redis_url)
+        # Blocking pool: callers wait for a free connection instead of failing
+        # when all 50 are checked out under load
+        pool = aioredis.BlockingConnectionPool.from_url(redis_url, max_connections=50)
+        _redis_client = aioredis.Redis(connection_pool=pool)
     return _redis_client
 
+async def close_redis_client() -> None:
+    """Close the shared Redis client and disconnect its pool, if it was used"""
+    global _redis_client, _file_lock_manager
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        # The pool was passed in explicitly, so aclose() leaves it open
+        await _redis_client.connection_pool.disconnect()
+        _redis_client = None
+        _file_lock_manager = None
+
 def get_file_lock_manager() -> FileLockManager:
     global _file_lock_manager
     if _file_lock_manager is None:
@@ -1,12 +1,22 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
+from cachetools import TTLCache
+from cryptography import x509
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from functools import lru_cache
+import hashlib
+import jwt
 import os
 import logging
+import time
 
 security = HTTPBearer()
 logger = logging.getLogger(__name__)
 
+# Validated users keyed by token digest; entries also expire at the token's own exp
+_CLAIMS_CACHE = TTLCache(maxsize=10_000, ttl=60)
+
+@lru_cache(maxsize=1)
 def get_public_key():
     # Helper to get public key payload
     key_path = os.getenv("CASDOOR_PUBLIC_KEY_PATH")
@@ -20,19 +30,40 @@ def get_public_key():
         
     return None
 
+@lru_cache(maxsize=1)
+def get_verification_key():
+    # Parse the PEM once into a cryptography key object so each request only
+    # pays for the RSA verify, not ASN.1 parsing. Casdoor ships an X.509
+    # certificate; a bare public key PEM is accepted as well.
+    pem = get_public_key()
+    if not pem:
+        return None
+    pem_bytes = pem.encode()
+    if b"BEGIN CERTIFICATE" in pem_bytes:
+        return x509.load_pem_x509_certificate(pem_bytes).public_key()
+    return load_pem_public_key(pem_bytes)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Validate JWT and return user info"""
     token = credentials.credentials
-    public_key = get_public_key()
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _CLAIMS_CACHE.get(cache_key)
+    if cached is not None:
+        exp, user = cached
+        if exp is None or exp > time.time():
+            return user
+        _CLAIMS_CACHE.pop(cache_key, None)
+
+    public_key = get_verification_key()
     
     try:
         payload = {}
         if not public_key:
              logger.warning("CASDOOR_PUBLIC_KEY not found! Skipping signature verification (DEV MODE ONLY).")
-             # Use get_unverified_claims to safely bypass all verification logic
-             payload = jwt.get_unverified_claims(token)
+             # Disable signature verification to safely bypass all verification logic
+             payload = jwt.decode(token, options={"verify_signature": False})
         else:
-             payload = jwt.decode(token, public_key, algorithms=["RS256"])
+             payload = jwt.decode(token, public_key, algorithms=["RS256"], options={"verify_aud": False})
         
         user_id = payload.get("sub") or payload.get("id")
         username = payload.get("name")
@@ -64,8 +95,10 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
                 # Fallback: built-in org members are admins
                 role = "admin"
 
-        return {"id": user_id, "username": username, "role": role}
+        user = {"id": user_id, "username": username, "role": role}
+        _CLAIMS_CACHE[cache_key] = (payload.get("exp"), user)
+        return user
 
-    except JWTError as e:
+    except jwt.PyJWTError as e:
         logger.error(f"JWT Validation Error: {str(e)}")
         raise HTTPException(status_code=401, detail=f"Invalid authentication: {str(e)}")
@@ -2,11 +2,13 @@ from functools import wraps
 from fastapi import HTTPException
 
 PERMISSIONS = {
-    "admin": ["read", "write", "delete", "manage_users"],
-    "editor": ["read", "write"],
-    "viewer": ["read"]
+    "admin": frozenset({"read", "write", "delete", "manage_users"}),
+    "editor": frozenset({"read", "write"}),
+    "viewer": frozenset({"read"})
 }
 
+_NO_PERMISSIONS = frozenset()
+
 def require_permission(permission: str):
     """
     Decorator to check user has permission.
@@ -21,7 +23,7 @@ def require_permission(permission: str):
             
             if current_user:
                 user_role = current_user.get("role", "viewer")
-                if permission not in PERMISSIONS.get(user_role, []):
+                if permission not in PERMISSIONS.get(user_role, _NO_PERMISSIONS):
                     raise HTTPException(status_code=403, detail=f"Insufficient permissions. Role '{user_role}' cannot '{permission}'.")
             else:
                 # Security Fix: If current_user is missing, it means the endpoint is not properly authenticated
@@ -6,20 +6,55 @@ Handles all cloud API LLM calls using LiteLLM for maximum flexibility.
 Supports OpenAI, Anthropic, Gemini, DeepSeek, and 100+ other providers.
 """
 
+import hashlib
 import logging
 import os
 from typing import AsyncGenerator, Dict, List, Optional
 
+import httpx
 import litellm
+import orjson
+from redis.exceptions import RedisError
 
-# Configure litellm to be less verbose if needed
-litellm.suppress_instrumentation_warnings = True
-
+from ...dependencies import get_redis_client
 from .exceptions import LLMAPIError, LLMAuthenticationError
 from .utils import sanitize_url
 
 logger = logging.getLogger("CloudProvider")
 
+# Configure litellm to be less verbose if needed
+litellm.suppress_instrumentation_warnings = True
+
+# Long-lived HTTP client shared by all LiteLLM async calls so keep-alive
+# connections (and their TLS sessions) are reused across requests.
+# Per-request timeouts are still set by the provider SDKs.
+_HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=64, max_connections=256, keepalive_expiry=30),
+    timeout=httpx.Timeout(600.0, connect=10.0),
+)
+litellm.aclient_session = _HTTP_CLIENT
+
+# TTL (seconds) for cached completions; 0 disables the cache
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+
+
+def _completion_cache_key(
+    model: Optional[str],
+    api_key: Optional[str],
+    messages: List[Dict[str, str]],
+    call_kwargs: Dict,
+) -> str:
+    """Hash everything that determines a completion into a Redis key."""
+    # The API key is part of the key so accounts never share answers;
+    # only its digest ends up in Redis.
+    raw = orjson.dumps(
+        {"model": model, "api_key": api_key, "messages": messages, "kwargs": call_kwargs},
+        option=orjson.OPT_SORT_KEYS,
+        default=str,
+    )
+    return f"llm:{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+
 async def complete(
     prompt: str,
     system_prompt: str = "You are a helpful assistant.",
@@ -29,10 +64,15 @@ async def complete(
     api_version: Optional[str] = None,
     binding: str = "openai",
     messages: Optional[List[Dict[str, str]]] = None,
+    cache: bool = False,
     **kwargs,
 ) -> str:
     """
     Complete a prompt using LiteLLM.
+
+    Answers are cached in Redis (LLM_CACHE_TTL) only for deterministic calls
+    (temperature=0) or when the caller passes cache=True; sampled calls such
+    as "rewrite" or "regenerate" always reach the model.
     """
     # preparing arguments
     model = model or os.getenv("LLM_MODEL")
@@ -65,6 +105,18 @@ async def complete(
     if api_version:
         call_kwargs["api_version"] = api_version
         
+    # Exact-match cache: identical model/key/messages/params return the stored answer
+    cacheable = LLM_CACHE_TTL > 0 and (cache or call_kwargs.get("temperature") == 0)
+    cache_key = _completion_cache_key(model, api_key, messages, call_kwargs) if cacheable else None
+    if cache_key:
+        try:
+            cached = await get_redis_client().get(cache_key)
+            if cached is not None:
+                logger.info(f"LLM cache hit for model={model}")
+                return cached.decode()
+        except RedisError as e:
+            logger.warning(f"LLM cache read failed: {e}")
+        
     logger.info(f"Calling LiteLLM with model={model}, api_key={'***' if api_key else None}")
     
     try:
@@ -75,7 +127,15 @@ async def complete(
             **call_kwargs
         )
         
-        return response.choices[0].message.content or ""
+        content = response.choices[0].message.content or ""
+        
+        if cache_key and content:
+            try:
+                await get_redis_client().set(cache_key, content, ex=LLM_CACHE_TTL)
+            except RedisError as e:
+                logger.warning(f"LLM cache write failed: {e}")
+        
+        return content
         
     except Exception as e:
         logger.error(f"LiteLLM completion failed: {e}")
@@ -146,8 +206,14 @@ async def fetch_models(
     # Implementing universal model fetching is complex.
     return [] 
 
+async def close_http_client() -> None:
+    """Close the shared LiteLLM HTTP client (call on application shutdown)."""
+    await _HTTP_CLIENT.aclose()
+
+
 __all__ = [
     "complete",
     "stream",
     "fetch_models",
+    "close_http_client",
 ]
@@ -1,5 +1,16 @@
 """Storage services for MinIO/S3 object storage"""
 
-from .minio_client import MinIOService, FileInfo, get_minio_service
+from .minio_client import MinIOService, FileInfo, get_minio_service, shard_path, DIRECTORY_INDEX_NAME, is_directory_index
+from .async_minio_client import AsyncMinIOService, get_async_minio_service, close_async_minio_service
 
-__all__ = ["MinIOService", "FileInfo", "get_minio_service"]
+__all__ = [
+    "MinIOService",
+    "FileInfo",
+    "get_minio_service",
+    "shard_path",
+    "DIRECTORY_INDEX_NAME",
+    "is_directory_index",
+    "AsyncMinIOService",
+    "get_async_minio_service",
+    "close_async_minio_service",
+]
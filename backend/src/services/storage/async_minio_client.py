@@ -0,0 +1,275 @@
+"""
+Async MinIO Storage Service
+==========================
+
+asyncio counterpart of MinIOService for event-loop callers.
+Talks to MinIO's S3 API through aiobotocore, so reads, listings and writes
+are awaited on the loop and share one connection pool instead of each
+occupying a worker thread.
+"""
+
+import asyncio
+import os
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+from botocore.exceptions import ClientError
+
+from .minio_client import FileInfo, is_directory_index
+
+logger = logging.getLogger("AsyncMinIOService")
+
+
+class AsyncMinIOService:
+    """Async service for MinIO operations (S3 API via aiobotocore)"""
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        secure: Optional[bool] = None,
+    ):
+        """
+        Configure the client; the connection is opened on first use.
+
+        Args:
+            endpoint: MinIO server endpoint (defaults to env MINIO_ENDPOINT)
+            access_key: MinIO access key (defaults to env MINIO_ACCESS_KEY)
+            secret_key: MinIO secret key (defaults to env MINIO_SECRET_KEY)
+            secure: Use HTTPS (defaults to env MINIO_USE_SSL)
+
+        The connection pool size comes from env MINIO_POOL_MAX, as for
+        MinIOService.
+        """
+        self.endpoint = endpoint or os.getenv("MINIO_ENDPOINT", "localhost:9002")
+        self.access_key = access_key or os.getenv("MINIO_ACCESS_KEY", "minioadmin")
+        self.secret_key = secret_key or os.getenv("MINIO_SECRET_KEY", "minioadmin")
+        self.secure = secure if secure is not None else os.getenv("MINIO_USE_SSL", "false").lower() == "true"
+        self.default_bucket = os.getenv("MINIO_DEFAULT_BUCKET", "wonderpedia")
+        self.pool_size = int(os.getenv("MINIO_POOL_MAX", "200"))
+
+        # One S3 client for the service's lifetime, opened lazily and closed by close()
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._client: Any = None
+        self._client_lock = asyncio.Lock()
+
+        # Caps concurrent GETs from get_files at the connection pool size, so a
+        # large batch waits for a slot instead of piling up on the pool
+        self._get_slots = asyncio.Semaphore(self.pool_size)
+
+    async def _get_client(self) -> Any:
+        """Open the shared S3 client on first use"""
+        if self._client is not None:
+            return self._client
+
+        async with self._client_lock:
+            if self._client is None:
+                # Imported here so importing the storage package doesn't load aiobotocore/aiohttp
+                from aiobotocore.config import AioConfig
+                from aiobotocore.session import get_session
+
+                scheme = "https" if self.secure else "http"
+                config = AioConfig(
+                    signature_version="s3v4",
+                    s3={"addressing_style": "path"},
+                    max_pool_connections=self.pool_size,
+                    connect_timeout=3,
+                    read_timeout=30,
+                    retries={"max_attempts": 3, "mode": "standard"}
+                )
+
+                exit_stack = AsyncExitStack()
+                self._client = await exit_stack.enter_async_context(
+                    get_session().create_client(
+                        "s3",
+                        endpoint_url=f"{scheme}://{self.endpoint}",
+                        aws_access_key_id=self.access_key,
+                        aws_secret_access_key=self.secret_key,
+                        region_name="us-east-1",
+                        config=config
+                    )
+                )
+                self._exit_stack = exit_stack
+                logger.info(f"Async MinIO client initialized: {self.endpoint} (secure={self.secure})")
+
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared S3 client and its connection pool"""
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+            self._client = None
+
+    async def list_files(
+        self,
+        bucket: str,
+        prefix: str = "",
+        recursive: bool = False,
+        extensions: Optional[List[str]] = None,
+        start_after: Optional[str] = None,
+        max_keys: Optional[int] = None
+    ) -> List[FileInfo]:
+        """
+        List files in a bucket.
+
+        Args:
+            bucket: Bucket name
+            prefix: Filter by prefix (e.g., "docs/")
+            recursive: List recursively (default: False)
+            extensions: Filter by file extensions (e.g., [".md", ".txt"])
+            start_after: Only return objects listed after this key (pagination)
+            max_keys: Stop after this many entries
+
+        Returns:
+            List of FileInfo objects in key order
+
+        Raises:
+            botocore.exceptions.ClientError: If listing fails
+        """
+        client = await self._get_client()
+        ext_tuple = tuple(extensions) if extensions else None
+
+        params = {"Bucket": bucket, "Prefix": prefix}
+        if not recursive:
+            params["Delimiter"] = "/"
+        if start_after:
+            if not recursive and start_after.endswith("/"):
+                # Resume after every key under the directory, as MinIOService.iter_files does
+                start_after += "\U0010ffff"
+            params["StartAfter"] = start_after
+
+        files = []
+        try:
+            async for page in client.get_paginator("list_objects_v2").paginate(**params):
+                files.extend(
+                    FileInfo(name=p["Prefix"], size=0, last_modified=None, is_dir=True)
+                    for p in page.get("CommonPrefixes", ())
+                )
+                files.extend(
+                    FileInfo(name=obj["Key"], size=obj.get("Size", 0), last_modified=obj.get("LastModified"))
+                    for obj in page.get("Contents", ())
+                    if (not ext_tuple or obj["Key"].endswith(ext_tuple)) and not is_directory_index(obj["Key"])
+                )
+
+                # Later pages only hold later keys, so max_keys entries are enough
+                if max_keys is not None and len(files) >= max_keys:
+                    break
+        except ClientError as e:
+            logger.error(f"Failed to list files in {bucket}: {e}")
+            raise
+
+        # S3 returns objects and common prefixes separately; merge into key
+        # order with one sort at the end instead of one per page
+        files.sort(key=lambda f: f.name)
+        if max_keys is not None:
+            del files[max_keys:]
+
+        logger.info(f"Listed {len(files)} items from {bucket}/{prefix} (recursive={recursive})")
+        return files
+
+    async def get_file(self, bucket: str, path: str) -> str:
+        """
+        Read file content as string.
+
+        Args:
+            bucket: Bucket name
+            path: File path in bucket
+
+        Returns:
+            File content as string
+
+        Raises:
+            botocore.exceptions.ClientError: If file not found or read error
+        """
+        client = await self._get_client()
+        try:
+            response = await client.get_object(Bucket=bucket, Key=path)
+            async with response["Body"] as body:
+                content = await body.read()
+        except ClientError as e:
+            logger.error(f"Failed to read file {bucket}/{path}: {e}")
+            raise
+
+        logger.info(f"Read file {bucket}/{path} ({len(content)} bytes)")
+        return content.decode("utf-8")
+
+    async def get_files(self, bucket: str, paths: List[str]) -> Dict[str, str]:
+        """
+        Read many files concurrently on the event loop, at most
+        MINIO_POOL_MAX GETs at a time.
+
+        Args:
+            bucket: Bucket name
+            paths: File paths in bucket
+
+        Returns:
+            Dict mapping each path to its content (same shape as
+            MinIOService.get_files)
+
+        Raises:
+            botocore.exceptions.ClientError: If any file is not found or cannot be read
+        """
+        async def fetch(path: str) -> str:
+            async with self._get_slots:
+                return await self.get_file(bucket, path)
+
+        contents = await asyncio.gather(*(fetch(path) for path in paths))
+        return dict(zip(paths, contents))
+
+    async def save_file(
+        self,
+        bucket: str,
+        path: str,
+        content: Union[str, bytes],
+        content_type: str = "text/markdown"
+    ) -> Dict[str, Any]:
+        """
+        Save content to file.
+
+        Args:
+            bucket: Bucket name
+            path: File path in bucket
+            content: File content (text is encoded as UTF-8)
+            content_type: MIME type (default: text/markdown)
+
+        Returns:
+            Dict with "size" in bytes and the "etag" and "version_id" of the write
+
+        Raises:
+            botocore.exceptions.ClientError: If write error
+        """
+        client = await self._get_client()
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        try:
+            response = await client.put_object(Bucket=bucket, Key=path, Body=data, ContentType=content_type)
+        except ClientError as e:
+            logger.error(f"Failed to save file {bucket}/{path}: {e}")
+            raise
+
+        logger.info(f"Saved file {bucket}/{path} ({len(data)} bytes)")
+        return {
+            "size": len(data),
+            "etag": response["ETag"].strip('"'),
+            "version_id": response.get("VersionId")
+        }
+
+
+# Global instance
+_async_minio_service: Optional[AsyncMinIOService] = None
+
+
+def get_async_minio_service() -> AsyncMinIOService:
+    """Get global async MinIO service instance"""
+    global _async_minio_service
+    if _async_minio_service is None:
+        _async_minio_service = AsyncMinIOService()
+    return _async_minio_service
+
+
+async def close_async_minio_service() -> None:
+    """Close the global async MinIO service, if it was used"""
+    if _async_minio_service is not None:
+        await _async_minio_service.close()
@@ -3,37 +3,200 @@ MinIO Storage Service
 ====================
 
 Service layer for MinIO object storage operations.
-Provides async methods for file listing, reading, writing, and searching.
+Provides blocking methods for file listing, reading, writing, and searching;
+async callers offload them to a thread pool or use AsyncMinIOService.
 """
 
+import hashlib
 import os
-from typing import List, Optional, Dict, Any
+import posixpath
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cache
+from io import BytesIO
 import logging
 
+import certifi
+import orjson
+import urllib3
+from cachetools import TTLCache
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
+from minio.select import JSONInputSerialization, JSONOutputSerialization, SelectRequest
+from rapidfuzz import fuzz, process
 
 logger = logging.getLogger("MinIOService")
 
+# Split points for parallel recursive listings. Each worker lists one key range
+# (previous boundary, boundary], so keys outside this alphabet are still covered.
+PARALLEL_LIST_BOUNDARIES = "0123456789abcdefghijklmnopqrstuvwxyz"
+PARALLEL_LIST_WORKERS = 16
 
+# Chunk size for reading object bodies
+READ_CHUNK_SIZE = 64 * 1024
+
+# Minimum fuzzy_search score (0-100); below it a name is noise, not a match
+FUZZY_SCORE_CUTOFF = 60
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+
+# Per-directory metadata sidecar (JSON Lines), queried with S3 Select.
+# Sidecars are internal: listings and searches never return them.
+DIRECTORY_INDEX_NAME = "_index.json"
+_DIRECTORY_INDEX_SUFFIX = "/" + DIRECTORY_INDEX_NAME
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+
+# Search stems that can be appended to a list prefix as-is: no wildcards, and
+# no "/" (which would reach into subdirectories the scan never returns)
+_LITERAL_STEM = re.compile(r"[^*?\[\]/]+")
+
+_FRONT_MATTER = re.compile(r"\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+
+# What query_directory_index accepts in its conditions; anything else is
+# rejected rather than spliced into the S3 Select expression
+_SELECT_FIELD = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+SELECT_OPERATORS = frozenset({"=", "!=", "<", "<=", ">", ">=", "LIKE"})
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def shard_path(path: str) -> str:
+    """
+    Spread keys of one large "directory" over 65536 sub-prefixes.
+    
+    "docs/a.md" becomes "docs/3f/9c/a.md", where the two levels come from a
+    hash of the original path. The mapping is deterministic, so readers derive
+    the stored key the same way instead of looking it up.
+    """
+    digest = hashlib.blake2b(path.encode("utf-8"), digest_size=2).hexdigest()
+    directory, filename = posixpath.split(path)
+    return posixpath.join(directory, digest[:2], digest[2:], filename)
+
+
+def _front_matter(text: str) -> Dict[str, str]:
+    """Flat `key: value` pairs from a markdown file's leading --- block"""
+    match = _FRONT_MATTER.match(text)
+    if not match:
+        return {}
+    fields = {}
+    for line in match.group(1).splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip() and not key.startswith((" ", "\t", "#")):
+            fields[key.strip()] = value.strip().strip("\"'")
+    return fields
+
+
+def is_directory_index(name: str) -> bool:
+    """Whether an object key is a write_directory_index sidecar"""
+    return name == DIRECTORY_INDEX_NAME or name.endswith(_DIRECTORY_INDEX_SUFFIX)
+
+
+def _select_condition(field: str, condition: Any) -> str:
+    """
+    One S3 Select condition over `s`, with the field name validated and
+    quoted and the value rendered as a literal (strings quoted and escaped).
+    """
+    if not _SELECT_FIELD.fullmatch(field):
+        raise ValueError(f"Invalid index field: {field!r}")
+    
+    operator, value = condition if isinstance(condition, (tuple, list)) else ("=", condition)
+    operator = str(operator).upper()
+    if operator not in SELECT_OPERATORS:
+        raise ValueError(f"Unsupported operator: {operator!r}")
+    
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        value = "'" + str(value).replace("'", "''") + "'"
+    return f's."{field}" {operator} {value}'
+
+
+def _read_text(response) -> str:
+    """
+    Read a GET response body as UTF-8 text and release the connection.
+    
+    The body is streamed in chunks into a bytearray preallocated from
+    Content-Length, then decoded. The connection is released even if
+    decoding fails.
+    """
+    try:
+        size = int(response.headers.get("Content-Length") or 0)
+        buf = bytearray(size)
+        offset = 0
+        for chunk in response.stream(READ_CHUNK_SIZE):
+            end = offset + len(chunk)
+            # In-place copy while within the preallocated size; grows otherwise
+            buf[offset:end] = chunk
+            offset = end
+        del buf[offset:]
+        return buf.decode('utf-8')
+    finally:
+        response.close()
+        response.release_conn()
+
+
+# Slotted (no per-instance __dict__: listings can hold hundreds of thousands of
+# these) and serialized natively by orjson, e.g. orjson.dumps(files), without
+# building a dict per entry. orjson skips the underscore-prefixed field.
+@dataclass(slots=True, eq=False)
 class FileInfo:
     """File metadata from MinIO"""
-    def __init__(self, name: str, size: int, last_modified: datetime, content_type: str = "", is_dir: bool = False):
-        self.name = name
-        self.size = size
-        self.last_modified = last_modified
-        self.content_type = content_type
-        self.is_dir = is_dir
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "size": self.size,
-            "last_modified": self.last_modified.isoformat() if self.last_modified else None,
-            "content_type": self.content_type,
-            "is_dir": self.is_dir
-        }
+    name: str
+    size: int
+    last_modified: Optional[datetime]
+    content_type: str = ""
+    is_dir: bool = False
+    # Lowercased once here so case-insensitive search/ranking never re-lowers per query
+    _name_lower: str = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self._name_lower = self.name.lower()
+
+
+class _SearchIndex:
+    """
+    Case-insensitive substring index over a fixed listing.
+    
+    Maps every three-character slice (trigram) of the lowercased names to the
+    positions of the files containing it, so a query only has to be checked
+    against files that contain all of its trigrams instead of every filename.
+    Queries shorter than a trigram fall back to a scan.
+    """
+    
+    def __init__(self, files: List[FileInfo]):
+        self.files = files
+        self._names = [file._name_lower for file in files]
+        self._postings: Dict[str, List[int]] = {}
+        for index, name in enumerate(self._names):
+            for gram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                self._postings.setdefault(gram, []).append(index)
+    
+    def search(self, query: str) -> List[FileInfo]:
+        """Files whose name contains the query (ignoring case), in listing order"""
+        needle = query.lower()
+        if len(needle) < 3:
+            return [file for file, name in zip(self.files, self._names) if needle in name]
+        
+        postings = []
+        for gram in {needle[i:i + 3] for i in range(len(needle) - 2)}:
+            if gram not in self._postings:
+                return []
+            postings.append(self._postings[gram])
+        postings.sort(key=len)
+        
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        # Sharing all trigrams doesn't guarantee they are contiguous; confirm
+        return [self.files[i] for i in sorted(candidates) if needle in self._names[i]]
 
 
 class MinIOService:
@@ -46,6 +209,11 @@ class MinIOService:
         MINIO_SECRET_KEY: Secret key
         MINIO_USE_SSL: Use HTTPS (default: false)
         MINIO_DEFAULT_BUCKET: Default bucket name
+        MINIO_LIST_TTL: Seconds to cache listing results in-process (default: 30)
+        MINIO_POOL_MAX: Max pooled connections to MinIO (default: 200)
+        MINIO_HEDGE_AFTER_MS: Issue a second, hedged GET in get_file when the
+            first has not finished after this many ms, e.g. the P95 read
+            latency (default: 0, disabled)
     """
     
     def __init__(
@@ -69,15 +237,47 @@ class MinIOService:
         self.secret_key = secret_key or os.getenv("MINIO_SECRET_KEY", "minioadmin")
         self.secure = secure if secure is not None else os.getenv("MINIO_USE_SSL", "false").lower() == "true"
         self.default_bucket = os.getenv("MINIO_DEFAULT_BUCKET", "wonderpedia")
+        self.hedge_after_ms = int(os.getenv("MINIO_HEDGE_AFTER_MS", "0"))
+        pool_max = int(os.getenv("MINIO_POOL_MAX", "200"))
+        
+        # Shared connection pool sized for concurrent requests, so calls reuse
+        # keep-alive connections instead of handshaking with MinIO each time
+        self.http_client = urllib3.PoolManager(
+            num_pools=10,
+            maxsize=pool_max,
+            block=False,
+            timeout=urllib3.Timeout(connect=3, read=30),
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504]
+            )
+        )
         
         # Initialize MinIO client
         self.client = Minio(
             self.endpoint,
             access_key=self.access_key,
             secret_key=self.secret_key,
-            secure=self.secure
+            secure=self.secure,
+            http_client=self.http_client
         )
         
+        # Threads for hedged GETs, shared by all reads; sized like the
+        # connection pool and only started when hedging is used
+        self._hedge_executor = ThreadPoolExecutor(max_workers=pool_max, thread_name_prefix="minio-hedge")
+        
+        # Listing results keyed by (bucket, prefix, recursive, extensions, ...);
+        # save_file/delete_file evict the listings that may contain the path
+        self._list_cache = TTLCache(maxsize=1024, ttl=float(os.getenv("MINIO_LIST_TTL", "30")))
+        self._list_cache_lock = threading.Lock()
+        
+        # Filename indexes built from cached listings, keyed by (bucket, prefix,
+        # recursive, extensions) and evicted together with them
+        self._search_index = TTLCache(maxsize=64, ttl=float(os.getenv("MINIO_LIST_TTL", "30")))
+        
         logger.info(f"MinIO client initialized: {self.endpoint} (secure={self.secure})")
     
     def list_buckets(self) -> List[str]:
@@ -94,12 +294,84 @@ class MinIOService:
             logger.error(f"Failed to list buckets: {e}")
             raise
 
+    def iter_files(
+        self,
+        bucket: str,
+        prefix: str = "",
+        recursive: bool = False,
+        extensions: Optional[List[str]] = None,
+        start_after: Optional[str] = None,
+        end_at: Optional[str] = None
+    ) -> Iterator[FileInfo]:
+        """
+        Lazily iterate files in a bucket.
+        
+        The underlying ListObjectsV2 calls are paged by the SDK, so callers
+        that stop consuming early (e.g. "first 100 matches") never fetch the
+        remaining pages. Results are not cached.
+        
+        Args:
+            bucket: Bucket name
+            prefix: Filter by prefix (e.g., "docs/")
+            recursive: List recursively (default: False)
+            extensions: Filter by file extensions (e.g., [".md", ".txt"])
+            start_after: Only yield objects listed after this key (pagination)
+            end_at: Stop listing once keys pass this one (checked before the
+                extension filter, so a range with no matches still ends here)
+        
+        Yields:
+            FileInfo objects in key order
+        """
+        if start_after and not recursive and start_after.endswith("/"):
+            # A page that ended on a directory resumes after every key under
+            # it; resuming right after "dir/" would list "dir/" again
+            start_after += "\U0010ffff"
+        
+        objects = self.client.list_objects(
+            bucket,
+            prefix=prefix,
+            recursive=recursive,
+            start_after=start_after
+        )
+        
+        # str.endswith takes a tuple and checks every suffix in C
+        ext_tuple = tuple(extensions) if extensions else None
+        
+        for obj in objects:
+            if end_at is not None and obj.object_name > end_at:
+                return
+            
+            is_dir = obj.is_dir
+            
+            # Filter by extension if specified, but ONLY for files
+            if not is_dir and ext_tuple and not obj.object_name.endswith(ext_tuple):
+                continue
+            
+            if not is_dir and is_directory_index(obj.object_name):
+                continue
+            
+            # Directories have no size/date in MinIO listing; their
+            # last_modified stays None, as in S3
+            size = obj.size if obj.size is not None else 0
+            
+            yield FileInfo(
+                name=obj.object_name,
+                size=size,
+                last_modified=obj.last_modified,
+                content_type=obj.content_type or "",
+                is_dir=is_dir
+            )
+    
     def list_files(
         self,
         bucket: str,
         prefix: str = "",
         recursive: bool = False,
-        extensions: Optional[List[str]] = None
+        extensions: Optional[List[str]] = None,
+        start_after: Optional[str] = None,
+        max_keys: Optional[int] = None,
+        parallel: bool = False,
+        use_cache: bool = True
     ) -> List[FileInfo]:
         """
         List files in a bucket.
@@ -109,85 +381,243 @@ class MinIOService:
             prefix: Filter by prefix (e.g., "docs/")
             recursive: List recursively (default: False)
             extensions: Filter by file extensions (e.g., [".md", ".txt"])
+            start_after: Only return objects listed after this key (pagination)
+            max_keys: Stop after this many results (default: no limit)
+            parallel: Split a full recursive listing into key ranges listed
+                concurrently (default: False). Ignored when paginating.
+            use_cache: Read and fill this process's listing cache (default:
+                True). Pass False when the result feeds a cache shared across
+                processes: writes made by other processes don't evict this one.
         
         Returns:
             List of FileInfo objects
         """
+        cache_key = (bucket, prefix, recursive, tuple(extensions) if extensions else None, start_after, max_keys)
+        if use_cache:
+            with self._list_cache_lock:
+                cached = self._list_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+        
         try:
-            objects = self.client.list_objects(
-                bucket,
-                prefix=prefix,
-                recursive=recursive
-            )
-            
-            files = []
-            for obj in objects:
-                is_dir = obj.is_dir
-                
-                # Filter by extension if specified, but ONLY for files
-                if not is_dir and extensions:
-                    if not any(obj.object_name.endswith(ext) for ext in extensions):
-                        continue
-                
-                # Directories have no size/date in MinIO listing
-                size = obj.size if obj.size is not None else 0
-                last_modified = obj.last_modified if obj.last_modified else datetime.now() 
-                
-                files.append(FileInfo(
-                    name=obj.object_name,
-                    size=size,
-                    last_modified=last_modified,
-                    content_type=obj.content_type or "",
-                    is_dir=is_dir
+            if parallel and recursive and start_after is None and max_keys is None:
+                files = self._list_files_parallel(bucket, prefix, extensions)
+            else:
+                files = list(islice(
+                    self.iter_files(bucket, prefix, recursive, extensions, start_after),
+                    max_keys
                 ))
             
             logger.info(f"Listed {len(files)} items from {bucket}/{prefix} (recursive={recursive})")
-            return files
             
         except S3Error as e:
             logger.error(f"Failed to list files in {bucket}: {e}")
             raise
+        
+        if not use_cache:
+            return files
+        
+        with self._list_cache_lock:
+            self._list_cache[cache_key] = files
+        return list(files)
+    
+    def invalidate(self, bucket: str, prefix: Optional[str] = None) -> None:
+        """
+        Evict cached listings affected by a change.
+        
+        Args:
+            bucket: Bucket name
+            prefix: Changed path or prefix; evicts every listing of the bucket
+                whose prefix covers it or lies under it. All listings of the
+                bucket are evicted when omitted.
+        """
+        with self._list_cache_lock:
+            stale = [
+                key for key in self._list_cache.keys()
+                if key[0] == bucket and (
+                    prefix is None or prefix.startswith(key[1]) or key[1].startswith(prefix)
+                )
+            ]
+            for key in stale:
+                self._list_cache.pop(key, None)
+            
+            stale = [
+                key for key in self._search_index.keys()
+                if key[0] == bucket and (
+                    prefix is None or prefix.startswith(key[1]) or key[1].startswith(prefix)
+                )
+            ]
+            for key in stale:
+                self._search_index.pop(key, None)
+    
+    def _list_files_parallel(
+        self,
+        bucket: str,
+        prefix: str,
+        extensions: Optional[List[str]]
+    ) -> List[FileInfo]:
+        """Recursive listing fanned out over key ranges; results stay in key order"""
+        bounds = [None] + [prefix + c for c in PARALLEL_LIST_BOUNDARIES] + [None]
+        
+        def list_range(lower: Optional[str], upper: Optional[str]) -> List[FileInfo]:
+            return list(self.iter_files(bucket, prefix, True, extensions, start_after=lower, end_at=upper))
+        
+        with ThreadPoolExecutor(max_workers=PARALLEL_LIST_WORKERS) as executor:
+            parts = executor.map(list_range, bounds[:-1], bounds[1:])
+            return [file for part in parts for file in part]
     
     def search_files(
         self,
         bucket: str,
         query: str,
         prefix: str = "",
-        case_sensitive: bool = False
+        case_sensitive: bool = False,
+        start_after: Optional[str] = None,
+        max_results: Optional[int] = None,
+        starts_with: bool = False,
+        recursive: bool = False,
+        extensions: Optional[List[str]] = None,
+        use_cache: bool = True
     ) -> List[FileInfo]:
         """
         Search files by name.
         
+        Case-insensitive substring searches look the query up in a trigram
+        index built from the cached listing; the others scan the listing.
+        
+        A case-sensitive `starts_with` search for a literal query (no
+        wildcards or "/"; a trailing `*` is allowed) is pushed down to MinIO
+        as a longer list prefix, so only the matching entries are listed.
+        
         Args:
             bucket: Bucket name
             query: Search query
             prefix: Filter by prefix
             case_sensitive: Case-sensitive search (default: False)
+            start_after: Only consider objects listed after this key (pagination)
+            max_results: Stop once this many matches are found
+            starts_with: Match only entries whose name after `prefix` starts
+                with the query, instead of containing it anywhere
+            recursive: Search below `prefix` recursively (default: False)
+            extensions: Filter by file extensions (e.g., [".md", ".txt"])
+            use_cache: Use this process's listing cache (see list_files)
         
         Returns:
             List of matching FileInfo objects
         """
-        all_files = self.list_files(bucket, prefix)
+        listing = {"recursive": recursive, "extensions": extensions, "start_after": start_after, "use_cache": use_cache}
+        stem = query[:-1] if query.endswith("*") else query
+        if case_sensitive and starts_with and _LITERAL_STEM.fullmatch(stem):
+            matches = self.list_files(bucket, prefix + stem, max_keys=max_results, **listing)
+        elif starts_with:
+            # S3 prefixes are case-sensitive, so this can't be pushed down
+            needle = stem if case_sensitive else stem.lower()
+            start = len(prefix)
+            matches = []
+            for file in self.list_files(bucket, prefix, **listing):
+                name = file.name if case_sensitive else file._name_lower
+                if name.startswith(needle, start):
+                    matches.append(file)
+                    if max_results is not None and len(matches) >= max_results:
+                        break
+        elif case_sensitive or not use_cache:
+            # The listing comes from the list cache, so repeat searches skip MinIO
+            needle = query if case_sensitive else query.lower()
+            matches = []
+            for file in self.list_files(bucket, prefix, **listing):
+                if needle in (file.name if case_sensitive else file._name_lower):
+                    matches.append(file)
+                    if max_results is not None and len(matches) >= max_results:
+                        break
+        else:
+            matches = self._get_search_index(bucket, prefix, recursive, extensions).search(query)
+            if start_after is not None:
+                matches = [f for f in matches if f.name > start_after]
+            if max_results is not None:
+                matches = matches[:max_results]
         
-        if not case_sensitive:
-            query = query.lower()
+        logger.info(f"Found {len(matches)} files matching '{query}' in {bucket}")
+        return matches
+    
+    def _get_search_index(
+        self,
+        bucket: str,
+        prefix: str,
+        recursive: bool,
+        extensions: Optional[List[str]]
+    ) -> _SearchIndex:
+        """Get (or build from the cached listing) the filename index for a listing"""
+        key = (bucket, prefix, recursive, tuple(extensions) if extensions else None)
+        with self._list_cache_lock:
+            index = self._search_index.get(key)
+        if index is None:
+            index = _SearchIndex(self.list_files(bucket, prefix, recursive=recursive, extensions=extensions))
+            with self._list_cache_lock:
+                self._search_index[key] = index
+        return index
+    
+    def fuzzy_search(
+        self,
+        bucket: str,
+        query: str,
+        prefix: str = "",
+        limit: int = 50,
+        files: Optional[List[FileInfo]] = None,
+        extensions: Optional[List[str]] = None,
+        score_cutoff: float = FUZZY_SCORE_CUTOFF
+    ) -> List[FileInfo]:
+        """
+        Rank files by fuzzy similarity between their name and the query.
         
-        matches = []
-        for file in all_files:
-            filename = file.name if case_sensitive else file.name.lower()
-            if query in filename:
-                matches.append(file)
+        Args:
+            bucket: Bucket name
+            query: Search query
+            prefix: Only consider files under this prefix
+            limit: Maximum number of ranked results
+            files: Pre-fetched recursive listing to rank (e.g. from a cache);
+                listed from MinIO when omitted
+            extensions: Only consider files with these extensions
+            score_cutoff: Minimum WRatio score (0-100) for a file to be returned
         
-        logger.info(f"Found {len(matches)} files matching '{query}' in {bucket}")
+        Returns:
+            Up to `limit` FileInfo objects, best match first
+        """
+        if files is None:
+            files = self.list_files(bucket, prefix, recursive=True)
+        
+        ext_tuple = tuple(extensions) if extensions else ()
+        candidates = [
+            f for f in files
+            if not f.is_dir and f.name.startswith(prefix) and (not ext_tuple or f.name.endswith(ext_tuple))
+        ]
+        ranked = process.extract(
+            query.lower(),
+            [f._name_lower for f in candidates],
+            scorer=fuzz.WRatio,
+            limit=limit,
+            score_cutoff=score_cutoff
+        )
+        matches = [candidates[index] for _, _, index in ranked]
+        
+        logger.info(f"Ranked {len(matches)} files for '{query}' in {bucket}/{prefix}")
         return matches
     
-    def get_file(self, bucket: str, path: str) -> str:
+    def get_file(
+        self,
+        bucket: str,
+        path: str,
+        hedge_after_ms: Optional[int] = None,
+        shard: bool = False
+    ) -> str:
         """
         Read file content as string.
         
         Args:
             bucket: Bucket name
             path: File path in bucket
+            hedge_after_ms: Race a second GET if the first is still running
+                after this many ms (defaults to MINIO_HEDGE_AFTER_MS; 0 disables)
+            shard: Path was written with save_file(..., shard=True)
         
         Returns:
             File content as string
@@ -195,11 +625,17 @@ class MinIOService:
         Raises:
             S3Error: If file not found or read error
         """
+        if hedge_after_ms is None:
+            hedge_after_ms = self.hedge_after_ms
+        if shard:
+            path = shard_path(path)
+        
         try:
-            response = self.client.get_object(bucket, path)
-            content = response.read().decode('utf-8')
-            response.close()
-            response.release_conn()
+            if hedge_after_ms > 0:
+                content = self._get_file_hedged(bucket, path, hedge_after_ms / 1000)
+            else:
+                response = self.client.get_object(bucket, path)
+                content = _read_text(response)
             
             logger.info(f"Read file {bucket}/{path} ({len(content)} bytes)")
             return content
@@ -208,17 +644,157 @@ class MinIOService:
             logger.error(f"Failed to read file {bucket}/{path}: {e}")
             raise
     
-    def list_file_versions(self, bucket: str, path: str) -> List[dict]:
+    def _get_file_hedged(self, bucket: str, path: str, hedge_after: float) -> str:
+        """
+        Tail-latency hedged read: if the first GET is slow, start a second one
+        and return whichever finishes first. The other response is closed and
+        its connection released, also when it only arrives after the winner.
+        """
+        lock = threading.Lock()
+        responses = []
+        settled = False
+        
+        def fetch() -> str:
+            response = self.client.get_object(bucket, path)
+            with lock:
+                if settled:
+                    # Lost the race before its body was read
+                    response.close()
+                    response.release_conn()
+                    return ""
+                responses.append(response)
+            return _read_text(response)
+        
+        try:
+            primary = self._hedge_executor.submit(fetch)
+            done, _ = wait([primary], timeout=hedge_after)
+            if done:
+                return primary.result()
+            
+            pending = {primary, self._hedge_executor.submit(fetch)}
+            error = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    error = future.exception()
+            raise error
+        finally:
+            with lock:
+                settled = True
+                started = list(responses)
+            # Aborts a losing read in progress (_read_text then releases its
+            # connection); the winner has already closed its response
+            for response in started:
+                response.close()
+    
+    def get_files(
+        self,
+        bucket: str,
+        paths: List[str],
+        max_workers: int = 32,
+        shard: bool = False
+    ) -> Dict[str, str]:
+        """
+        Read many small files concurrently.
+        
+        Per-object request overhead dominates for small markdown files, so the
+        GETs are fanned out over a thread pool sharing the client's connection
+        pool instead of being issued one after another.
+        
+        Args:
+            bucket: Bucket name
+            paths: File paths in bucket
+            max_workers: Number of concurrent GETs (e.g. 32, 64, 128)
+            shard: Paths were written with save_file(..., shard=True)
+        
+        Returns:
+            Dict mapping each (logical) path to its content
+        
+        Raises:
+            S3Error: If any file is not found or cannot be read
+        """
+        if not paths:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+            contents = executor.map(lambda path: self.get_file(bucket, path, shard=shard), paths)
+            return dict(zip(paths, contents))
+    
+    def stat_object(self, bucket: str, path: str, shard: bool = False) -> FileInfo:
+        """
+        Get file metadata with a single HEAD request.
+        
+        Args:
+            bucket: Bucket name
+            path: File path in bucket
+            shard: Path was written with save_file(..., shard=True)
+        
+        Returns:
+            FileInfo for the object
+        
+        Raises:
+            S3Error: If file not found (code "NoSuchKey") or stat error
+        """
+        if shard:
+            path = shard_path(path)
+        
+        stat = self.client.stat_object(bucket, path)
+        return FileInfo(
+            name=stat.object_name,
+            size=stat.size or 0,
+            last_modified=stat.last_modified,
+            content_type=stat.content_type or "",
+            is_dir=False
+        )
+    
+    def get_file_stream(
+        self,
+        bucket: str,
+        path: str,
+        version_id: Optional[str] = None,
+        shard: bool = False
+    ):
+        """
+        Open a file for streaming without reading it into memory.
+        
+        Args:
+            bucket: Bucket name
+            path: File path in bucket
+            version_id: Optional version ID to retrieve
+            shard: Path was written with save_file(..., shard=True)
+        
+        Returns:
+            urllib3 response; the caller must close() and release_conn() it
+        
+        Raises:
+            S3Error: If file not found or read error
+        """
+        if shard:
+            path = shard_path(path)
+        
+        try:
+            return self.client.get_object(bucket, path, version_id=version_id)
+        except S3Error as e:
+            logger.error(f"Failed to open file {bucket}/{path}: {e}")
+            raise
+    
+    def list_file_versions(self, bucket: str, path: str, shard: bool = False) -> List[dict]:
         """
         List all versions of a file.
         
         Args:
             bucket: Bucket name
             path: File path in bucket
+            shard: Path was written with save_file(..., shard=True)
         
         Returns:
             List of version info dicts with keys: version_id, last_modified, size, is_latest
         """
+        if shard:
+            path = shard_path(path)
+        
         try:
             versions = []
             # List objects with versions enabled
@@ -245,7 +821,34 @@ class MinIOService:
             logger.error(f"Failed to list versions for {bucket}/{path}: {e}")
             raise
     
-    def get_file_version(self, bucket: str, path: str, version_id: str) -> str:
+    def stat_version(self, bucket: str, path: str, version_id: str, shard: bool = False) -> dict:
+        """
+        Get metadata for a specific version of a file with a single HEAD request.
+        
+        Args:
+            bucket: Bucket name
+            path: File path in bucket
+            version_id: Version ID to look up
+            shard: Path was written with save_file(..., shard=True)
+        
+        Returns:
+            Version info dict with keys: version_id, last_modified, size, content_type
+        
+        Raises:
+            S3Error: If version not found (code "NoSuchVersion") or stat error
+        """
+        if shard:
+            path = shard_path(path)
+        
+        stat = self.client.stat_object(bucket, path, version_id=version_id)
+        return {
+            "version_id": stat.version_id,
+            "last_modified": stat.last_modified.isoformat() if stat.last_modified else None,
+            "size": stat.size or 0,
+            "content_type": stat.content_type or ""
+        }
+    
+    def get_file_version(self, bucket: str, path: str, version_id: str, shard: bool = False) -> str:
         """
         Read specific version of a file.
         
@@ -253,19 +856,21 @@ class MinIOService:
             bucket: Bucket name
             path: File path in bucket
             version_id: Version ID to retrieve
+            shard: Path was written with save_file(..., shard=True)
         
         Returns:
             File content as string for the specified version
         """
+        if shard:
+            path = shard_path(path)
+        
         try:
             response = self.client.get_object(
                 bucket, 
                 path,
                 version_id=version_id
             )
-            content = response.read().decode('utf-8')
-            response.close()
-            response.release_conn()
+            content = _read_text(response)
             
             logger.info(f"Read file {bucket}/{path} version {version_id} ({len(content)} bytes)")
             return content
@@ -273,51 +878,82 @@ class MinIOService:
         except S3Error as e:
             logger.error(f"Failed to read file {bucket}/{path} version {version_id}: {e}")
             raise
-
     
-    def save_file(self, bucket: str, path: str, content: str) -> int:
+    def save_file(
+        self,
+        bucket: str,
+        path: str,
+        content: Union[str, bytes, bytearray, memoryview, BinaryIO],
+        content_type: str = "text/markdown",
+        shard: bool = False
+    ) -> Dict[str, Any]:
         """
         Save file content.
         
         Args:
             bucket: Bucket name
             path: File path in bucket
-            content: File content as string
+            content: File content as string (encoded as UTF-8), raw bytes, or a
+                binary file-like object which is uploaded without copying
+            content_type: Content type stored with the object
+            shard: Store under hash sub-prefixes (see shard_path), for
+                directories that grow to many thousands of keys
         
         Returns:
-            File size in bytes
+            Dict with "size" in bytes (-1 for a non-seekable stream of unknown
+            length), plus the "etag" and "version_id" MinIO returned for the
+            write, so callers need no follow-up stat
         
         Raises:
             S3Error: If write error
         """
+        if shard:
+            path = shard_path(path)
+        
         try:
-            from io import BytesIO
+            part_size = 0
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                length = len(content)
+                data_stream = BytesIO(content)
+            else:
+                data_stream = content
+                if data_stream.seekable():
+                    # Known length keeps this a single PUT instead of multipart
+                    start = data_stream.tell()
+                    length = data_stream.seek(0, os.SEEK_END) - start
+                    data_stream.seek(start)
+                else:
+                    length = -1
+                    part_size = 10 * 1024 * 1024
             
-            data = content.encode('utf-8')
-            data_stream = BytesIO(data)
-            
-            self.client.put_object(
+            result = self.client.put_object(
                 bucket,
                 path,
                 data_stream,
-                length=len(data),
-                content_type="text/markdown"
+                length=length,
+                content_type=content_type,
+                part_size=part_size
             )
             
-            logger.info(f"Saved file {bucket}/{path} ({len(data)} bytes)")
-            return len(data)
+            self.invalidate(bucket, path)
+            
+            logger.info(f"Saved file {bucket}/{path} ({length} bytes)")
+            return {"size": length, "etag": result.etag, "version_id": result.version_id}
             
         except S3Error as e:
             logger.error(f"Failed to save file {bucket}/{path}: {e}")
             raise
     
-    def delete_file(self, bucket: str, path: str) -> bool:
+    def delete_file(self, bucket: str, path: str, shard: bool = False) -> bool:
         """
         Delete a file.
         
         Args:
             bucket: Bucket name
             path: File path in bucket
+            shard: Path was written with save_file(..., shard=True)
         
         Returns:
             True if successful
@@ -325,8 +961,12 @@ class MinIOService:
         Raises:
             S3Error: If delete error
         """
+        if shard:
+            path = shard_path(path)
+        
         try:
             self.client.remove_object(bucket, path)
+            self.invalidate(bucket, path)
             logger.info(f"Deleted file {bucket}/{path}")
             return True
             
@@ -334,31 +974,178 @@ class MinIOService:
             logger.error(f"Failed to delete file {bucket}/{path}: {e}")
             raise
     
-    def file_exists(self, bucket: str, path: str) -> bool:
+    def delete_files(self, bucket: str, paths: List[str], shard: bool = False) -> List[str]:
+        """
+        Delete many files with batched DeleteObjects requests.
+        
+        Args:
+            bucket: Bucket name
+            paths: File paths in bucket
+            shard: Paths were written with save_file(..., shard=True)
+        
+        Returns:
+            Paths that could not be deleted (empty if all succeeded); storage
+            keys when sharded
+        
+        Raises:
+            S3Error: If a delete request itself fails
+        """
+        if shard:
+            paths = [shard_path(path) for path in paths]
+        
+        failed = []
+        try:
+            for batch in _chunks(paths, DELETE_BATCH_SIZE):
+                # remove_objects is lazy: consuming the errors sends the request
+                for error in self.client.remove_objects(bucket, (DeleteObject(p) for p in batch)):
+                    logger.error(f"Failed to delete file {bucket}/{error.name}: {error.message}")
+                    failed.append(error.name)
+        except S3Error as e:
+            logger.error(f"Failed to delete files in {bucket}: {e}")
+            raise
+        finally:
+            if paths:
+                self.invalidate(bucket, os.path.commonprefix(paths))
+        
+        deleted = set(paths).difference(failed)
+        logger.info(f"Deleted {len(deleted)} files from {bucket} ({len(failed)} failed)")
+        return failed
+    
+    def file_exists(self, bucket: str, path: str, shard: bool = False) -> bool:
         """
         Check if file exists.
         
         Args:
             bucket: Bucket name
             path: File path in bucket
+            shard: Path was written with save_file(..., shard=True)
         
         Returns:
             True if file exists
+        
+        Raises:
+            S3Error: For errors other than a missing key or bucket
         """
+        if shard:
+            path = shard_path(path)
+        
         try:
             self.client.stat_object(bucket, path)
             return True
-        except S3Error:
-            return False
-
-
-# Global service instance
-_minio_service: Optional[MinIOService] = None
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchBucket"):
+                return False
+            raise
+    
+    def select(
+        self,
+        bucket: str,
+        path: str,
+        expression: str,
+        input_serialization,
+        output_serialization
+    ) -> bytes:
+        """
+        Run an S3 Select query so MinIO returns only the matching records.
+        
+        Args:
+            bucket: Bucket name
+            path: CSV/JSON/Parquet object in bucket
+            expression: SQL expression (e.g. "SELECT * FROM S3Object s")
+            input_serialization: minio.select input serialization
+            output_serialization: minio.select output serialization
+        
+        Returns:
+            Matching records in the output serialization's format
+        
+        Raises:
+            S3Error: If the object is missing or the query fails
+        """
+        request = SelectRequest(expression, input_serialization, output_serialization)
+        try:
+            with self.client.select_object_content(bucket, path, request) as result:
+                return b"".join(result.stream())
+        except S3Error as e:
+            logger.error(f"Failed to select from {bucket}/{path}: {e}")
+            raise
+    
+    def write_directory_index(self, bucket: str, prefix: str = "") -> int:
+        """
+        Write the `_index.json` sidecar for one directory.
+        
+        Each markdown file directly under `prefix` becomes one JSON line with
+        its name, size, last_modified and front-matter fields, so metadata
+        scans can query the sidecar (see query_directory_index) instead of
+        downloading every file.
+        
+        Args:
+            bucket: Bucket name
+            prefix: Directory prefix (e.g., "docs/")
+        
+        Returns:
+            Number of files indexed
+        """
+        files = [
+            f for f in self.list_files(bucket, prefix, extensions=list(MARKDOWN_EXTENSIONS))
+            if not f.is_dir
+        ]
+        contents = self.get_files(bucket, [f.name for f in files])
+        
+        rows = bytearray()
+        for file in files:
+            row = _front_matter(contents[file.name])
+            row.update(name=file.name, size=file.size, last_modified=file.last_modified)
+            rows += orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+        
+        self.save_file(bucket, prefix + DIRECTORY_INDEX_NAME, rows, content_type="application/json")
+        logger.info(f"Indexed {len(files)} files in {bucket}/{prefix}")
+        return len(files)
+    
+    def query_directory_index(
+        self,
+        bucket: str,
+        prefix: str = "",
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query a directory's `_index.json` sidecar with S3 Select.
+        
+        Conditions are structured, never raw SQL: field names must be plain
+        identifiers and values are rendered as quoted literals, so they are
+        safe to take from user input.
+        
+        Args:
+            bucket: Bucket name
+            prefix: Directory prefix the sidecar was written for
+            where: Conditions ANDed together, each mapping a field to a value
+                (equality) or to an (operator, value) pair with an operator
+                from SELECT_OPERATORS, e.g.
+                {"status": "draft", "tags": ("LIKE", "%math%")}
+        
+        Returns:
+            Matching index rows
+        
+        Raises:
+            ValueError: If a field name or operator is not accepted
+            S3Error: If the directory has no sidecar or the query fails
+        """
+        expression = "SELECT * FROM S3Object s"
+        if where:
+            expression += " WHERE " + " AND ".join(
+                _select_condition(field, condition) for field, condition in where.items()
+            )
+        
+        data = self.select(
+            bucket,
+            prefix + DIRECTORY_INDEX_NAME,
+            expression,
+            JSONInputSerialization(json_type="LINES"),
+            JSONOutputSerialization(record_delimiter="\n")
+        )
+        return [orjson.loads(line) for line in data.splitlines() if line]
 
 
+@cache
 def get_minio_service() -> MinIOService:
-    """Get global MinIO service instance"""
-    global _minio_service
-    if _minio_service is None:
-        _minio_service = MinIOService()
-    return _minio_service
+    """Get global MinIO service instance (created on first call)"""
+    return MinIOService()
@@ -70,7 +70,8 @@ export default function FileEditorPage() {
       const safePath = path.split('/').map(encodeURIComponent).join('/');
       const res = await fetch(`${API_BASE}/api/v1/files/${bucket}/${safePath}`, {
         headers: {
-          'Authorization': `Bearer ${token}`
+          'Authorization': `Bearer ${token}`,
+          'Accept': 'application/json'
         }
       });
       if (!res.ok) {
@@ -24,6 +24,8 @@ export default function FileBrowserPage() {
   const [files, setFiles] = useState<FileMetadata[]>([]);
   const [searchQuery, setSearchQuery] = useState('');
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextToken, setNextToken] = useState<string | null>(null);
   const [error, setError] = useState('');
 
   // Load buckets on mount (wait for auth)
@@ -72,8 +74,13 @@ export default function FileBrowserPage() {
     }
   };
 
-  const fetchFiles = async () => {
-    setLoading(true);
+  // Without a token, (re)load the first page; with one, append the next page
+  const fetchFiles = async (continuationToken?: string) => {
+    if (continuationToken) {
+      setLoadingMore(true);
+    } else {
+      setLoading(true);
+    }
     setError('');
     try {
       const params = new URLSearchParams({
@@ -82,6 +89,9 @@ export default function FileBrowserPage() {
         search: searchQuery,
         extensions: '.md,.markdown,.txt,.json'
       });
+      if (continuationToken) {
+        params.set('continuation_token', continuationToken);
+      }
       
       const res = await fetch(`${API_BASE}/api/v1/files/${selectedBucket}?${params}`, {
         headers: {
@@ -96,19 +106,27 @@ export default function FileBrowserPage() {
       
       const data = await res.json();
       
-      // Sort: folders first, then files
-      const sortedFiles = (data.files || []).sort((a: FileMetadata, b: FileMetadata) => {
-        if (a.is_dir === b.is_dir) {
-            return a.name.localeCompare(b.name);
-        }
-        return a.is_dir ? -1 : 1;
-      });
+      const pageFiles: FileMetadata[] = data.files || [];
+      const allFiles = continuationToken ? [...files, ...pageFiles] : pageFiles;
       
-      setFiles(sortedFiles);
+      // Queries of 2+ characters come back ranked best match first; keep that order
+      if (searchQuery.length >= 2) {
+        setFiles(allFiles);
+      } else {
+        // Sort: folders first, then files
+        setFiles(allFiles.sort((a: FileMetadata, b: FileMetadata) => {
+          if (a.is_dir === b.is_dir) {
+              return a.name.localeCompare(b.name);
+          }
+          return a.is_dir ? -1 : 1;
+        }));
+      }
+      setNextToken(data.is_truncated ? data.next_token : null);
     } catch (err: any) {
       setError(err.message);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -222,7 +240,7 @@ export default function FileBrowserPage() {
                   className="w-full px-4 py-2 pr-10 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
                 />
                 <button
-                  onClick={fetchFiles}
+                  onClick={() => fetchFiles()}
                   className="absolute right-2 top-1/2 -translate-y-1/2 text-gray-400 hover:text-gray-600"
                 >
                   <Search className="w-5 h-5" />
@@ -362,6 +380,19 @@ export default function FileBrowserPage() {
           )}
         </div>
 
+        {/* Load More (the API returns at most 1000 entries per page) */}
+        {nextToken && !loading && (
+          <div className="mt-4 text-center">
+            <button
+              onClick={() => fetchFiles(nextToken)}
+              disabled={loadingMore}
+              className="px-4 py-2 text-sm border border-gray-300 rounded-lg text-gray-700 hover:bg-gray-50 disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
+
         {/* Footer Stats */}
         {files.length > 0 && (
           <div className="mt-4 text-sm text-gray-500 text-center">
@@ -75,7 +75,8 @@ export default function DiffViewerModal({ bucket, path, currentContent, isOpen,
       const safePath = path.split('/').map(encodeURIComponent).join('/');
       const res = await fetch(`${API_BASE}/api/v1/files/${bucket}/${safePath}/versions/${versionId}`, {
         headers: {
-            'Authorization': `Bearer ${token}`
+            'Authorization': `Bearer ${token}`,
+            'Accept': 'application/json'
         }
       });
       if (!res.ok) throw new Error('Failed to fetch version content');